@@ -1,6 +1,23 @@
 from utils.csv_utils import *
 from utils.poster_utils import *
+from utils.poster_utils import _find_poster_url, _found_poster_urls, _process_film
+from utils.cli import get_csv_absolute_path, main, parse_args
+from utils.progress_utils import read_with_progress
+from rich.progress import Progress
+from PIL import Image
+import http.server
+import io
 import itertools
+import pytest
+import os
+import threading
+
+
+def jpeg_bytes(width=40, height=60):
+    """Returns the contents of a blank jpeg image of the given size."""
+    image = io.BytesIO()
+    Image.new('RGB', (width, height)).save(image, 'JPEG')
+    return image.getvalue()
 
 
 def test_csv_cannot_be_empty(tmp_path):
@@ -21,19 +38,37 @@ def test_non_empty_csv_must_contain_required_columns(tmp_path):
     assert not is_valid_letterboxd_format(csv_file)
 
 
-def test_required_columns_can_occur_in_any_order(tmp_path):
-    arrangements = itertools.permutations(['Position', 'Name', 'Year', 'URL', 'Description'])
-    for arrangement in arrangements:
-        content = f"""
+COLUMNS_IN_SOME_ORDER_TEMPLATE = """
         Letterboxd list export v7,,,,
         Date,Name,Tags,URL,Description
         2023-04-17,A test lis,Sort by colour,The url,A test list.
         ,,,,
-        {','.join(arrangement)}
+        {columns}
         """
-        csv_file = tmp_path / 'columns_in_some_order.csv'
-        csv_file.write_text(content)
-        assert is_valid_letterboxd_format(csv_file)
+COLUMN_ARRANGEMENTS = list(itertools.permutations(['Position', 'Name', 'Year', 'URL', 'Description']))
+
+
+@pytest.mark.parametrize('arrangement', COLUMN_ARRANGEMENTS)
+def test_required_columns_can_occur_in_any_order(tmp_path, arrangement):
+    csv_file = tmp_path / 'columns_in_some_order.csv'
+    csv_file.write_text(COLUMNS_IN_SOME_ORDER_TEMPLATE.format(columns=','.join(arrangement)))
+    assert is_valid_letterboxd_format(csv_file)
+
+
+@pytest.mark.parametrize('arrangement', COLUMN_ARRANGEMENTS)
+def test_headers_in_any_order_are_parsed(tmp_path, arrangement):
+    csv_file = tmp_path / 'columns_in_some_order.csv'
+    csv_file.write_text(COLUMNS_IN_SOME_ORDER_TEMPLATE.format(columns=','.join(arrangement)))
+    csv_sections = parse_letterboxd_csv(csv_file)
+    assert csv_sections.headers == list(arrangement)
+    assert len(csv_sections.extra_info) == 5
+
+
+@pytest.mark.parametrize('content', ['', 'Film Name,Release Year,URL\n'])
+def test_csv_without_required_columns_is_not_parsed(tmp_path, content):
+    csv_file = tmp_path / 'no_columns.csv'
+    csv_file.write_text(content)
+    assert parse_letterboxd_csv(csv_file) is None
 
 
 def test_poster_dir_is_created_in_the_same_location_as_the_csv(tmp_path):
@@ -43,3 +78,245 @@ def test_poster_dir_is_created_in_the_same_location_as_the_csv(tmp_path):
     posters_path = create_posters_dir(parent_dir=str(parent), dir_name='posters', msg='')
     assert posters_path == str(parent / 'posters')
     assert len(list(parent.iterdir())) == 2
+
+
+def test_csv_path_is_asked_for_until_it_is_an_existing_csv_file(tmp_path, monkeypatch):
+    csv_file = tmp_path / 'films.csv'
+    csv_file.touch()
+    not_a_csv = tmp_path / 'films.txt'
+    not_a_csv.touch()
+    answers = iter([str(tmp_path / 'missing.csv'), str(not_a_csv), str(csv_file)])
+    monkeypatch.setattr('builtins.input', lambda _: next(answers))
+    assert get_csv_absolute_path('films.csv') == str(csv_file)
+
+
+def test_saved_poster_urls_are_loaded_back(tmp_path):
+    assert load_poster_urls(tmp_path) == {}
+    poster_urls = {'https://boxd.it/2aUc': 'https://a.ltrbxd.com/resized/film-poster/amelie.jpg'}
+    save_poster_urls(poster_urls, tmp_path)
+    assert load_poster_urls(tmp_path) == poster_urls
+
+
+def test_headers_are_found_after_long_lines(tmp_path):
+    long_description = 'A very long list description. ' * 500
+    content = f"""Letterboxd list export v7,,,,
+Date,Name,Tags,URL,Description
+2023-04-17,A test list,Sort by colour,The url,{long_description}
+,,,,
+Position,Name,Year,URL,Description
+"""
+    csv_file = tmp_path / 'long_description.csv'
+    csv_file.write_text(content)
+    assert is_valid_letterboxd_format(csv_file)
+    assert not is_valid_letterboxd_format(csv_file, max_lines_to_check=4)
+
+
+def test_url_column_can_be_named_letterboxd_uri(tmp_path):
+    content = """Date,Name,Year,Letterboxd URI
+2023-04-17,Amélie,2001,https://boxd.it/2aUc
+"""
+    csv_file = tmp_path / 'diary.csv'
+    csv_file.write_text(content, encoding='utf-8')
+    assert is_valid_letterboxd_format(csv_file)
+    csv_sections = parse_letterboxd_csv(csv_file)
+    assert get_url_header(csv_sections.headers) == 'Letterboxd URI'
+    assert csv_sections.film_info.urls == ['https://boxd.it/2aUc']
+
+
+def test_column_names_must_match_whole_cells(tmp_path):
+    csv_file = tmp_path / 'similar_columns.csv'
+    csv_file.write_text('Film Name,Release Year,URL\n')
+    assert not is_valid_letterboxd_format(csv_file)
+
+
+def test_csv_is_split_into_sections():
+    csv_file = Path(__file__).parent.parent / 'samples' / 'sample_list.csv'
+    csv_sections = parse_letterboxd_csv(csv_file)
+    assert len(csv_sections.extra_info) == 4
+    assert csv_sections.headers == ['Position', 'Name', 'Year', 'URL', 'Description']
+    assert len(csv_sections.film_info.names) == 35
+    assert csv_sections.film_info.names[0] == 'The Secret Life of Walter Mitty'
+    assert csv_sections.film_info.years[0] == '2013'
+    assert csv_sections.film_info.urls[0] == 'https://boxd.it/3SWy'
+
+
+def test_csv_without_headers_is_not_parsed(tmp_path):
+    csv_file = tmp_path / 'no_columns.csv'
+    csv_file.write_text('Date,Name,Tags,URL,Description\n')
+    assert parse_letterboxd_csv(csv_file) is None
+
+
+def test_poster_url_is_only_taken_from_script_tags():
+    film_page = """
+    <img src="https://a.ltrbxd.com/resized/avatar/upload/someone.jpg">
+    <script type="application/ld+json">
+    {"image":"https://a.ltrbxd.com/resized/film-poster/amelie.jpg"}
+    </script>
+    """
+    assert get_poster_url(film_page) == 'https://a.ltrbxd.com/resized/film-poster/amelie.jpg'
+    assert get_poster_url('<img src="https://a.ltrbxd.com/resized/film-poster/amelie.jpg">') is None
+
+
+def test_all_posters_are_downloaded_only_when_each_film_has_its_poster(tmp_path):
+    film_info = FilmInfo(urls=['', ''], names=['RRR', 'Oldboy'], years=['', ''])
+    csv_sections = CSVInfo([], ['Name', 'Year', 'URL'], film_info)
+    (tmp_path / 'RRR.jpg').touch()
+    (tmp_path / 'Aliens.jpg').touch()
+    assert not all_posters_downloaded(csv_sections, tmp_path)
+    (tmp_path / 'Oldboy.jpg').touch()
+    assert all_posters_downloaded(csv_sections, tmp_path)
+
+
+def test_poster_file_name_stays_inside_the_posters_dir():
+    assert poster_file_name('../Amélie') == '.._Amélie.jpg'
+    assert poster_file_name('Face/Off') == 'Face_Off.jpg'
+
+
+@pytest.mark.skipif(os.name == 'nt', reason='Windows does not allow colons in file names')
+def test_poster_file_name_keeps_characters_allowed_by_the_system():
+    assert poster_file_name('Spider-Man: Into the Spider-Verse') == 'Spider-Man: Into the Spider-Verse.jpg'
+
+
+def test_download_poster_leaves_no_partial_file(tmp_path):
+    download_poster(jpeg_bytes(), 'Face/Off', str(tmp_path))
+    assert os.listdir(tmp_path) == ['Face_Off.jpg']
+    with Image.open(tmp_path / 'Face_Off.jpg') as im:
+        assert im.size == (20, 30)
+
+
+def test_disabled_progress_bar_shows_no_downloads():
+    class Response:
+        headers = {'content-length': '6'}
+
+        def iter_content(self, chunk_size):
+            yield from (b'abc', b'def')
+
+        def close(self):
+            pass
+
+    progress = Progress(disable=True)
+    progress.add_task = None  # fails if a bar is added
+    assert read_with_progress(Response(), 'poster', progress) == b'abcdef'
+
+
+def test_quoted_rows_under_the_headers_are_parsed(tmp_path):
+    csv_file = tmp_path / 'quoted.csv'
+    csv_file.write_text('Date,Name,Description,Year,URL\n2024,"Crouching Tiger, Hidden Dragon","two\nlines",2000,u\n')
+    film_info = parse_letterboxd_csv(csv_file).film_info
+    assert film_info.names == ['Crouching Tiger, Hidden Dragon']
+    assert film_info.years == ['2000']
+
+
+def test_posters_are_shrunk_before_being_saved(tmp_path):
+    save_resized_poster(jpeg_bytes(), str(tmp_path / 'RRR.jpg'))
+    with Image.open(tmp_path / 'RRR.jpg') as im:
+        assert im.size == (20, 30)
+
+
+def test_recently_searched_poster_urls_are_kept(monkeypatch):
+    searched = []
+
+    def fake_film_page_html(film_url, msg, progress=None, session=None):
+        searched.append(film_url)
+        return f'<script>{film_url}/poster.jpg</script>'
+
+    monkeypatch.setattr('utils.poster_utils.get_film_page_html', fake_film_page_html)
+    monkeypatch.setattr('utils.poster_utils.POSTER_URL_CACHE_SIZE', 2)
+    monkeypatch.setattr('utils.poster_utils._found_poster_urls', type(_found_poster_urls)())
+    for film_url in ['https://boxd.it/a', 'https://boxd.it/b', 'https://boxd.it/a', 'https://boxd.it/c']:
+        _find_poster_url(film_url, 'Film', None, None)
+    _find_poster_url('https://boxd.it/a', 'Film', None, None)
+    assert searched == ['https://boxd.it/a', 'https://boxd.it/b', 'https://boxd.it/c']
+
+
+def test_stale_saved_poster_url_is_searched_again(tmp_path):
+    film_url = 'https://boxd.it/2aUc'
+    new_poster_url = 'https://a.ltrbxd.com/resized/film-poster/amelie-new.jpg'
+    bodies = {film_url: f'<script>{new_poster_url}</script>'.encode(), new_poster_url: jpeg_bytes()}
+
+    class Response:
+        def __init__(self, url):
+            self.status_code = 200 if url in bodies else 404
+            self.body = bodies.get(url, b'Not Found')
+            self.headers = {}
+            self.encoding = 'utf-8'
+
+        def raise_for_status(self):
+            if self.status_code != 200:
+                raise requests.exceptions.HTTPError(self.status_code)
+
+        def iter_content(self, chunk_size):
+            yield self.body
+
+        def close(self):
+            pass
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc_info):
+            self.close()
+
+    class Session:
+        def get(self, url, **kwargs):
+            return Response(url)
+
+    poster_urls = {film_url: 'https://a.ltrbxd.com/resized/film-poster/amelie-old.jpg'}
+    picture_path = str(tmp_path / 'Amélie.jpg')
+    assert _process_film('Amélie', film_url, picture_path, poster_urls, Session()) == ('Amélie', POSTER_SAVED)
+    assert poster_urls == {film_url: new_poster_url}
+    assert os.path.exists(picture_path)
+
+
+def test_film_is_not_found_when_the_server_keeps_failing(tmp_path, monkeypatch):
+    class UnavailableHandler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(503)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), UnavailableHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr('utils.poster_utils.HTTP_BACKOFF_FACTOR', 0)
+    session = create_session()
+    session.trust_env = False  # no proxies for the local server
+    film_url = f'http://127.0.0.1:{server.server_port}/film/amelie/'
+    try:
+        result = _process_film('Amélie', film_url, str(tmp_path / 'Amélie.jpg'), {}, session)
+    finally:
+        server.shutdown()
+        session.close()
+    assert result == ('Amélie', POSTER_NOT_FOUND)
+
+
+@pytest.mark.parametrize('workers', ['0', '-3', 'many'])
+def test_number_of_workers_must_be_positive(workers):
+    with pytest.raises(SystemExit):
+        parse_args(['films.csv', '--workers', workers])
+    assert parse_args(['films.csv', '--workers', '4']).workers == 4
+
+
+def test_headers_are_found_with_carriage_return_line_endings(tmp_path):
+    csv_file = tmp_path / 'old_mac.csv'
+    csv_file.write_bytes(b'Letterboxd list export v7\rName,Year,URL\rAmelie,2001,https://boxd.it/2aUc\r')
+    assert is_valid_letterboxd_format(csv_file)
+    assert parse_letterboxd_csv(csv_file).film_info.names == ['Amelie']
+
+
+def test_poster_urls_are_not_written_when_nothing_was_found(tmp_path):
+    (tmp_path / 'RRR.jpg').touch()
+    film_info = FilmInfo(urls=['https://boxd.it/ljDs'], names=['RRR'], years=['2022'])
+    get_posters(CSVInfo([], ['Name', 'Year', 'URL'], film_info), tmp_path, Console())
+    assert os.listdir(tmp_path) == ['RRR.jpg']
+
+
+def test_posters_are_not_fetched_when_all_are_downloaded(tmp_path, monkeypatch):
+    csv_file = tmp_path / 'films.csv'
+    csv_file.write_text('Name,Year,URL\nRRR,2022,https://boxd.it/ljDs\n')
+    (tmp_path / 'posters').mkdir()
+    (tmp_path / 'posters' / 'RRR.jpg').touch()
+    monkeypatch.setattr('utils.cli.get_posters', lambda *args: pytest.fail('posters were fetched'))
+    main(str(csv_file))
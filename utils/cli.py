@@ -0,0 +1,201 @@
+"""Utility functions for running the program from the command line"""
+
+import argparse
+import os
+import sys
+from pathlib import Path
+from textwrap import dedent
+from typing import Optional
+from utils.csv_utils import (
+    is_valid_letterboxd_format,
+    parse_letterboxd_csv,
+    valid_csv_format_message,
+)
+from utils.poster_utils import (
+    all_posters_downloaded,
+    create_posters_dir,
+    get_posters,
+    MAX_DOWNLOAD_WORKERS,
+)
+from rich.console import Console
+
+# shown when asking for the csv path again. Dedented once here, rather than on every prompt
+CSV_PATH_PROMPT_TEMPLATE = dedent(
+    """
+    {short_message}
+    Please re-enter the full path again.
+    (q to quit)
+    full path > """
+)
+
+
+def parse_args(args: Optional[list[str]] = None) -> argparse.Namespace:
+    """Parses the command line arguments.
+
+    Parameters
+    ----------
+    args : list[str] or None, optional
+        The arguments to parse. When not given, the arguments the program was run with are used.
+
+    Returns
+    -------
+    argparse.Namespace
+        The parsed arguments, i.e. `film_list_csv`, `workers` and `full_size`.
+    """
+    parser = argparse.ArgumentParser()
+    parser.add_argument('film_list_csv', help='Absolute path of the csv file representing your letterboxd film list')
+    parser.add_argument(
+        '--workers',
+        type=_positive_int,
+        default=MAX_DOWNLOAD_WORKERS,
+        help=f'Number of posters to download at the same time (default: {MAX_DOWNLOAD_WORKERS})',
+    )
+    parser.add_argument(
+        '--full-size',
+        action='store_true',
+        help='Save posters as they are downloaded, instead of shrinking them first',
+    )
+    return parser.parse_args(args)
+
+
+def _positive_int(value: str) -> int:
+    """Converts a command line argument to an integer, accepting only positive ones.
+
+    Parameters
+    ----------
+    value : str
+        The argument, as it was given on the command line.
+
+    Returns
+    -------
+    int
+        The argument, as an integer.
+
+    Raises
+    ------
+    argparse.ArgumentTypeError
+        If the argument is not a positive integer.
+    """
+    try:
+        number = int(value)
+    except ValueError:
+        number = 0
+
+    if number < 1:
+        raise argparse.ArgumentTypeError(f'{value!r} is not a positive whole number')
+    return number
+
+
+def main(film_csv_path: str, max_workers: int = MAX_DOWNLOAD_WORKERS, resize: bool = True) -> None:
+    """Downloads the posters of the films in the csv file, into a `posters` folder next to the csv file.
+
+    Parameters
+    ----------
+    film_csv_path : str
+        The absolute path of the csv file of films.
+    max_workers : int, optional
+        The maximum number of films whose posters are fetched at the same time.
+    resize : bool, optional
+        Whether posters are shrunk before being saved.
+
+    Returns
+    -------
+    None
+    """
+    console = Console(color_system='truecolor')
+    csv_path = get_csv_absolute_path(film_csv_path)
+
+    # the header row is looked for in a single block from the start of the file, before the whole file is parsed
+    if not is_valid_letterboxd_format(csv_path):
+        sys.exit(valid_csv_format_message())
+
+    csv_sections = parse_letterboxd_csv(csv_path)
+
+    posters_dir_name = 'posters'  # directory in which to save the posters
+
+    # the folder is only created (and the message shown) if it does not exist yet
+    msg = f'\n┣━ {posters_dir_name} folder created\n'
+    posters_dir = Path(create_posters_dir(os.path.dirname(csv_path), posters_dir_name, msg))
+
+    # nothing is fetched or printed when every poster is already on disk. Otherwise, `get_posters` skips those
+    # that were already downloaded
+    if not all_posters_downloaded(csv_sections, posters_dir):
+        get_posters(csv_sections, posters_dir, console, max_workers, resize)
+
+
+def get_csv_absolute_path(film_csv_path: str) -> str:
+    """Gets and returns the user-entered absolute path of the csv file.
+
+    If no absolute path is given, the user is repeatedly prompted.
+
+    Parameters
+    ----------
+    film_csv_path : str
+        The absolute path of the csv file of films.
+
+    Returns
+    -------
+    str
+        The absolute path of the csv file of films.
+        If no absolute path is provided, one is continuously asked for.
+    """
+    while True:
+        # only absolute paths of existing .csv files are accepted
+        if not os.path.isabs(film_csv_path):
+            short_message = 'The path you provided is not a full path.'
+        elif not os.path.exists(film_csv_path):
+            short_message = 'The file you provided does not exist.'
+        elif not film_csv_path.lower().endswith('.csv'):
+            short_message = 'The file you provided is not a .csv file.'
+        else:
+            return film_csv_path
+
+        film_csv_path = get_csv_path(short_message)
+
+
+def get_csv_path(short_message: str) -> str:
+    """Gets, and returns the user-entered csv path.
+
+    The message displayed while asking for input is a combination of the provided short message,
+    and a message that asks for an absolute path to be entered.
+
+    Parameters
+    ----------
+    short_message : str
+        The short message, that will be combined with the message asking for an absolute path.
+
+    Returns
+    -------
+        str
+            The path to the csv file entered by the user.
+    Notes
+    -----
+    Validating whether the csv path is in fact an absolute path is not done in this
+    function.
+    """
+    return _read_input(CSV_PATH_PROMPT_TEMPLATE.format(short_message=short_message))
+
+
+def _read_input(prompt: str) -> str:
+    """Returns the user's answer to the given prompt, exiting the program if the user chose to quit.
+
+    The user quits by entering `q`, or by interrupting the program (e.g. with Ctrl+C).
+
+    Parameters
+    ----------
+    prompt : str
+        The message displayed while asking for input.
+
+    Returns
+    -------
+    str
+        The text entered by the user.
+    """
+    try:
+        answer = input(prompt)
+    except (KeyboardInterrupt, EOFError):
+        sys.exit('\nGoodbye')
+
+    if answer.lower() == 'q':
+        sys.exit('Goodbye!')
+    return answer
@@ -1,182 +1,286 @@
 """A collection of utility functions for managing csv-file-related actions."""
 
-from pathlib import Path, PurePath
 from textwrap import dedent
-import sys
 import csv
-import re
+import io
 from collections import namedtuple
-import os
+from itertools import chain, islice
+from operator import itemgetter
+from typing import Iterable, Iterator, Optional, Sequence, TextIO
 
 MAX_CSV_ROWS_TO_FIND_HEADERS = 6
+HEADER_SEARCH_BLOCK_SIZE = 4096  # characters read at once from the start of the csv file, when looking for headers
+CSV_READ_BUFFER_SIZE = 1 << 18  # bytes, so that large csv files are read with few system calls
 
-# all possible orders of the `URL`, `Name`, and `year` columns in the csv file
-CSV_REQUIRED_HEADERS_PATTERN = r"""
-(URL).*(Name).*(Year)|
-(URL).*(Year).*(Name)|
-(Name).*(URL).*(Year)|
-(Name).*(Year).*(URL)|
-(Year).*(URL).*(Name)|
-(Year).*(Name).*(URL)
-""".strip()
+# the header row must have a `Name` and a `Year` column, and a url column under any of the accepted names.
+# The columns can be in any order
+CSV_REQUIRED_HEADERS = frozenset(['Name', 'Year'])
+CSV_URL_HEADERS = ('URL', 'Letterboxd URI', 'LetterboxdURI')
 
 CSVInfo = namedtuple('CSVInfo', ['extra_info', 'headers', 'film_info'])
+# the films, stored column by column. Only the columns that are used are kept
+FilmInfo = namedtuple('FilmInfo', ['urls', 'names', 'years'])
 
+# shown when the csv file does not have the required column headers. Dedented once here, rather than on every call
+VALID_CSV_FORMAT_MESSAGE = dedent(
+    f"""
+    Could not find all the required column labels `Name`, `URL` and `Year`.
+    
+    Make sure those column labels occur within the first {MAX_CSV_ROWS_TO_FIND_HEADERS} lines of your
+    csv file.
+    
+    The expected format looks similar to this 
+    Note: The `Name`, `URL`, and `Year` columns can be in any order:
+
+    │ ... │ ...    │ ...  │ ...                  │ ... │
+    ├─────┼────────┼──────┼──────────────────────┼─────┤
+    │ ... │ Name   │ Year │ URL                  │ ... │
+    ├─────┼────────┼──────┼──────────────────────┼─────┤
+    │ ... │ Amélie │ 2001 │ https://boxd.it/2aUc │ ... │
+    ├─────┼────────┼──────┼──────────────────────┼─────┤
+    │ ... │ RRR    │ 2022 │ https://boxd.it/ljDs │ ... │
+    ├─────┼────────┼──────┼──────────────────────┼─────┤
+    │ ... │ Oldboy │ 2003 │ https://boxd.it/29R2 │ ... │
+    ├─────┼────────┼──────┼──────────────────────┼─────┤
+    │ ... │ ...    │ ...  │ ...                  │ ... │
+    
+    Check your csv file columns and try again.
+    """
+)
 
-def get_csv_absolute_path(film_csv_path: str) -> str:
-    """Gets and returns the user-entered absolute path of the csv file.
 
-    If no absolute path is given, the user is repeatedly prompted.
+def is_valid_letterboxd_format(
+    csv_file: str,
+    max_lines_to_check: int = MAX_CSV_ROWS_TO_FIND_HEADERS,
+) -> bool:
+    """Checks whether the provided csv list of films has column headers compatible with
+    Letterboxd's csv format.
 
     Parameters
     ----------
-    film_csv_path : str
-        The absolute path of the csv file of films.
+    csv_file : str
+        The film csv file to be checked.
+    max_lines_to_check : int
+        The maximum number of lines to check in the csv file, beyond which if no header columns are found,
+        the csv file is considered invalid.
 
     Returns
     -------
-    str
-        The absolute path of the csv file of films.
-        If no absolute path is provided, one is continuously asked for.
+    bool
+        True if the csv file has the required headers, False otherwise.
+
+    Notes
+    -----
+    The required column headers are `Name`, `URL`, and `Year`, which can occur in any order in the csv file.
+    The `URL` column may also be called `Letterboxd URI`, as it is in Letterboxd's diary and watched exports.
+
     """
-    # only absolute paths are accepted
-    while not PurePath.is_absolute(PurePath(film_csv_path)):
-        short_message = 'The path you provided is not a full path.'
-        film_csv_path = get_csv_path(short_message)
+    with open(csv_file, 'r', encoding='utf-8-sig', newline='') as f:
+        return _find_header_row(f, max_lines_to_check) is not None
 
-    # the file must exist
-    while not Path.exists(Path(film_csv_path)):
-        short_message = 'The file you provided does not exist.'
-        film_csv_path = get_csv_path(short_message)
 
-    # the existing file must be a .csv file
-    while '.csv' not in PurePath(film_csv_path).suffix:
-        short_message = 'The file you provided is not a .csv file.'
-        film_csv_path = get_csv_path(short_message)
+def _read_header_band(f: TextIO, max_lines_to_check: int) -> list[str]:
+    """Reads the first lines of the csv file, in which the header row is looked for.
+
+    The lines are taken from a single block read in the common case, rather than being read one at a time.
+
+    Parameters
+    ----------
+    f : TextIO
+        The csv file, opened for reading from its start.
+    max_lines_to_check : int
+        The number of lines in which the header row is looked for.
+
+    Returns
+    -------
+    list[str]
+        The first `max_lines_to_check` lines, without their line endings. They are followed by one more item,
+        holding the rest of what was read, if the file goes on past them.
+    """
+    head = f.read(HEADER_SEARCH_BLOCK_SIZE)
+    lines = head.split('\n', max_lines_to_check)
+
+    # the block holds all the lines to check if it goes past the last of them, or if it is the whole file.
+    # Otherwise, the lines are too long to fit in the block, so the rest of them is read as well
+    if len(lines) <= max_lines_to_check and len(head) == HEADER_SEARCH_BLOCK_SIZE:
+        head += ''.join(islice(f, max_lines_to_check))
+        lines = head.split('\n', max_lines_to_check)
 
-    return film_csv_path
+    return lines
 
 
-def get_csv_path(short_message: str) -> str:
-    """Gets, and returns the user-entered csv path.
+def _find_header_row(
+    f: TextIO, max_lines_to_check: int
+) -> Optional[tuple[list[list[str]], list[str], Iterator[list[str]]]]:
+    """Looks for the header row within the first lines of the csv file.
 
-    The message displayed while asking for input is a combination of the provided short message,
-    and a message that asks for an absolute path to be entered.
+    Letterboxd never quotes the lines up to its header row, so they are split on commas without the csv module.
+    The csv module is only used for them if they have quoted cells, or lines ending in a lone carriage return.
 
     Parameters
     ----------
-    short_message : str
-        The short message, that will be combined with the message asking for an absolute path.
+    f : TextIO
+        The csv file, opened for reading from its start, with `newline=''`.
+    max_lines_to_check : int
+        The number of lines in which the header row is looked for.
 
     Returns
     -------
-        str
-            The path to the csv file entered by the user.
-    Notes
-    -----
-    Validating whether the csv path is in fact an absolute path is not done in this
-    function.
+    tuple[list[list[str]], list[str], Iterator[list[str]]] or None
+        The rows that come before the header row, the header row itself, and a csv reader of the rows under it.
+        None if no header row was found.
     """
-    full_message = dedent(
-        f"""
-        {short_message}
-        Please re-enter the full path again.
-        (q to quit)
-        full path > """
-    )
-    try:
-        film_csv_path = input(full_message)
-    except KeyboardInterrupt:
-        sys.exit('\nGoodbye')
+    lines = _read_header_band(f, max_lines_to_check)
+    header_band = lines[:max_lines_to_check]
+
+    if any('"' in line or '\r' in line[:-1] for line in header_band):
+        f.seek(0)
+        reader = csv.reader(f)
+        band_rows = islice(reader, max_lines_to_check)
+    else:
+        reader = None
+        band_rows = map(_split_unquoted_line, header_band)
+
+    extra_info = []
+    for index, row in enumerate(band_rows):
+        if _is_header_row(row):
+            break
+        extra_info.append(row)
     else:
-        if film_csv_path.lower() == 'q':
-            sys.exit('Goodbye!')
-    return film_csv_path
+        return None
 
+    if reader is None:
+        # the csv module takes over from the line under the header row. The last line that was read is completed
+        # first, since the csv module ends a row at the end of each line it is given, unless it is inside quotes
+        rest = '\n'.join(lines[index + 1 :]) + f.readline()
+        reader = csv.reader(chain(io.StringIO(rest, newline=''), f))
 
-def is_valid_letterboxd_format(
-    csv_file: str,
-    max_lines_to_check: int = MAX_CSV_ROWS_TO_FIND_HEADERS,
-    header_pattern: str = CSV_REQUIRED_HEADERS_PATTERN,
-) -> bool:
-    """Checks whether the provided csv list of films has column headers compatible with
-    Letterboxd's csv format.
+    return extra_info, row, reader
+
+
+def _is_header_row(row: Sequence[str]) -> bool:
+    """Returns True if the row contains all the required column headers, in any order. Returns False otherwise.
 
     Parameters
     ----------
-    csv_file : str
-        The film csv file to be checked.
-    max_lines_to_check : int
-        The maximum number of lines to check in the csv file, beyond which if no header columns are found,
-        the csv file is considered invalid.
-    header_pattern : str
-        The pattern used to find and match the accepted column headers.
+    row : Sequence[str]
+        The cells of a single row of the csv file.
 
     Returns
     -------
     bool
-        True if the csv file has the required headers, False otherwise.
+        True if the row contains all the required column headers, False otherwise.
+    """
+    # rows with too few cells to hold every required header are ruled out without building a set
+    if len(row) < len(CSV_REQUIRED_HEADERS) + 1:
+        return False
 
-    Notes
-    -----
-    The required column headers are `Name`, `URL`, and `Year`, which can occur in any order in the csv file.
+    cells = {cell.strip() for cell in row}
+    return CSV_REQUIRED_HEADERS <= cells and not cells.isdisjoint(CSV_URL_HEADERS)
 
-    """
-    with open(csv_file, 'r', encoding='utf-8') as f:
-        lines = []
 
-        while True:
-            line = f.readline()
-            if not line or (not len(lines) < max_lines_to_check):
-                break
-            lines.append(line)
-        rows = ''.join(lines)
+def get_url_header(headers: list[str]) -> Optional[str]:
+    """Returns the name of the column that holds the Letterboxd url of each film.
+
+    Parameters
+    ----------
+    headers : list[str]
+        The header row of the csv file.
 
-        if re.search(header_pattern, rows, re.VERBOSE):
-            return True
-    return False
+    Returns
+    -------
+    str or None
+        The first of the accepted url column names (`CSV_URL_HEADERS`) that is in the header row,
+        or None if there is none.
+    """
+    return next((header for header in CSV_URL_HEADERS if header in headers), None)
 
 
-def get_csv_sections(csv_file: str, header_pattern: str = CSV_REQUIRED_HEADERS_PATTERN) -> CSVInfo:
+def parse_letterboxd_csv(
+    csv_file: str, max_lines_to_check: int = MAX_CSV_ROWS_TO_FIND_HEADERS
+) -> Optional[CSVInfo]:
     """Returns the information in the csv file, split into three sections: extra info, headers, film info.
+    Returns None if the csv file does not have the required column headers.
+
+    The file is read only once, with the header row being looked for while the rows are read.
 
     Parameters
     ----------
     csv_file : str
         The film csv file to be processed.
-    header_pattern : str
-        The pattern used to find and match the accepted column headers.
+    max_lines_to_check : int
+        The maximum number of rows to check in the csv file, beyond which if no header columns are found,
+        the csv file is considered invalid.
 
     Returns
     -------
-    CSVInfo
+    CSVInfo or None
         A named tuple containing sections extracted from the csv file. The sections include:
 
         * `extra_info`: a list of all the rows the appear before the header row.
-        * `headers`: a list containing the header row itself.
-        * `film_info`: a list of rows that come after the header row.
+        * `headers`: a list containing the header row itself, with surrounding whitespace removed from each column name.
+        * `film_info`: a `FilmInfo` named tuple holding the rows that come after the header row. The urls, names,
+          and years of the films are kept in separate lists, and the other columns are left out.
+
+        None if no header row was found.
     """
-    extra_info = []
-    headers = None
-    film_info = []
+    with open(csv_file, 'r', encoding='utf-8-sig', buffering=CSV_READ_BUFFER_SIZE, newline='') as f:
+        header_search = _find_header_row(f, max_lines_to_check)
+        if header_search is None:
+            return None
+
+        extra_info, header_row, reader = header_search
+        headers = [header.strip() for header in header_row]
+        column_indices = (headers.index(get_url_header(headers)), headers.index('Name'), headers.index('Year'))
+        # the reader carries on with the rows under the header, skipping blank lines
+        urls, names, years = _get_columns(filter(None, reader), column_indices)
+
+    return CSVInfo(extra_info, headers, FilmInfo(urls, names, years))
+
+
+def _split_unquoted_line(line: str) -> list[str]:
+    """Returns the cells of a line of the csv file that has no quoted cells, the same way the csv module would.
+
+    Parameters
+    ----------
+    line : str
+        A single line of the csv file, without its line feed.
+
+    Returns
+    -------
+    list[str]
+        The cells of the line. Empty for a blank line.
+    """
+    line = line.rstrip('\r')
+    return line.split(',') if line else []
+
 
-    with open(csv_file, 'r', encoding='utf-8') as f:
-        non_header_reader = csv.reader(f)
+def _get_columns(rows: Iterable[list[str]], indices: Sequence[int]) -> tuple[list[str], ...]:
+    """Returns the cells at the given positions of each row, column by column, in a single pass over the rows.
+    Rows that are too short to have a cell at one of the positions give an empty cell.
 
-        for non_header_line in non_header_reader:
-            rows = ', '.join(non_header_line)
-            if re.search(header_pattern, rows, re.VERBOSE):
-                headers = non_header_line
-                break
-            extra_info.append(non_header_line)
+    Only the cells at the given positions are kept, so each full row can be freed as soon as it has been read.
 
-        # switch to a dict reader to get the data under the header columns
-        header_reader = csv.DictReader(f, fieldnames=headers)
+    Parameters
+    ----------
+    rows : Iterable[list[str]]
+        The rows of the csv file.
+    indices : Sequence[int]
+        The positions of the columns in each row.
 
-        for header_line in header_reader:
-            film_info.append(header_line)
+    Returns
+    -------
+    tuple[list[str], ...]
+        One list of cells for each of the given positions, with one cell for each row.
+    """
+    get_cells = itemgetter(*indices)
+    row_length = max(indices) + 1
+    padding = [''] * row_length
 
-    return CSVInfo(extra_info, headers, film_info)
+    cells = [get_cells(row) if len(row) >= row_length else get_cells(row + padding) for row in rows]
+    if not cells:
+        return tuple([] for _ in indices)
+    return tuple(map(list, zip(*cells)))
 
 
 def valid_csv_format_message() -> str:
@@ -187,30 +291,4 @@ def valid_csv_format_message() -> str:
         str
             A brief description and an example table showing the expected format of the film csv file.
     """
-    message = dedent(
-        f"""
-    Could not find all the required column labels `Name`, `URL` and `Year`.
-    
-    Make sure those column labels occur within the first {MAX_CSV_ROWS_TO_FIND_HEADERS} lines of your
-    csv file.
-    
-    The expected format looks similar to this 
-    Note: The `Name`, `URL`, and `Year` columns can be in any order:
-
-    │ ... │ ...    │ ...  │ ...                  │ ... │
-    ├─────┼────────┼──────┼──────────────────────┼─────┤
-    │ ... │ Name   │ Year │ URL                  │ ... │
-    ├─────┼────────┼──────┼──────────────────────┼─────┤
-    │ ... │ Amélie │ 2001 │ https://boxd.it/2aUc │ ... │
-    ├─────┼────────┼──────┼──────────────────────┼─────┤
-    │ ... │ RRR    │ 2022 │ https://boxd.it/ljDs │ ... │
-    ├─────┼────────┼──────┼──────────────────────┼─────┤
-    │ ... │ Oldboy │ 2003 │ https://boxd.it/29R2 │ ... │
-    ├─────┼────────┼──────┼──────────────────────┼─────┤
-    │ ... │ ...    │ ...  │ ...                  │ ... │
-    
-    Check your csv file columns and try again.
-    """
-    )
-
-    return message
+    return VALID_CSV_FORMAT_MESSAGE
@@ -3,23 +3,117 @@
 import os
 import re
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import DecodeError, ProtocolError
+from urllib3.util.retry import Retry
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Optional
-from pathlib import Path, PurePath
-from bs4 import BeautifulSoup
-from utils.progress_utils import show_progress_bar
-from typing import Callable, Optional
-from PIL import Image
+from pathlib import Path
+from utils.progress_utils import read_with_progress, create_films_progress_bar, BAR_COLOR
+from rich.progress import Progress
+from PIL import Image, UnidentifiedImageError
 from utils.csv_utils import CSVInfo
 from rich.console import Console
 import io
+import json
+import shutil
+import hashlib
 import sys
+import threading
+from collections import OrderedDict
+from contextlib import ExitStack, contextmanager, suppress
 
 
 FILM_POSTER_URL_PATTERN = r'https:\/\/a\.ltrbxd\.com\/resized\/.*?\.jpg'
+FILM_POSTER_URL_RE = re.compile(FILM_POSTER_URL_PATTERN)
+SCRIPT_TAG_RE = re.compile(r'<script\b[^>]*>(.*?)</script>', re.DOTALL | re.IGNORECASE)
 SHRINK_FACTOR = 2
 HARD_ERROR_COLOR = 'deep_pink4'
 IN_PROGRESS_COLOR = 'green'
 SOFT_ERROR_COLOR = 'grey70'
+MAX_DOWNLOAD_WORKERS = 16  # number of films whose posters are fetched at the same time
+
+# statuses reported back for each film once its poster has been dealt with
+POSTER_EXISTS = 'exists'
+POSTER_SAVED = 'saved'
+POSTER_NOT_FOUND = 'not found'
+
+HTTP_RETRIES = 3  # number of times a failed request is retried
+HTTP_BACKOFF_FACTOR = 0.3  # seconds, doubled between consecutive retries
+HTTP_TIMEOUT = (5, 30)  # seconds to wait for a connection, and for data, before a request is given up on
+USER_AGENT = 'letterboxdHueSort'
+POSTER_EXTENSION = '.jpg'  # file extension with which posters are saved
+POSTER_URLS_FILE_NAME = '.poster_urls.json'  # remembers poster urls found on previous runs
+POSTER_CACHE_SIZE = 64  # number of recently fetched posters kept in memory
+POSTER_URL_CACHE_SIZE = 4096  # number of film pages whose poster urls are kept in memory
+POSTER_STREAM_CHUNK_SIZE = 1 << 16  # bytes written at a time when saving full-size posters
+PARTIAL_FILE_SUFFIX = '.part'  # posters are written under this suffix, and renamed once they are complete
+# characters that are not allowed in file names, or that would let a film name leave the posters folder.
+# Windows reserves many more of them than other systems, where film names are otherwise kept as they are
+if os.name == 'nt':
+    UNSAFE_FILE_NAME_CHARS_RE = re.compile(r'[<>:"/\\|?*\x00-\x1f]')
+else:
+    UNSAFE_FILE_NAME_CHARS_RE = re.compile(r'[/\x00]')
+
+# errors that only mean a single film's page or poster could not be fetched or read. The film's poster is then
+# reported as not found, while connection errors still stop the whole run
+_FILM_FETCH_ERRORS = (
+    requests.exceptions.HTTPError,
+    requests.exceptions.RetryError,
+    requests.exceptions.ChunkedEncodingError,
+    requests.exceptions.ContentDecodingError,
+    ProtocolError,  # raised instead of the two above when full-size posters are streamed
+    DecodeError,
+    UnidentifiedImageError,
+)
+
+
+def create_session(pool_size: int = MAX_DOWNLOAD_WORKERS) -> requests.Session:
+    """Creates the http session through which film pages and posters are fetched.
+
+    The session keeps connections alive, so that consecutive requests to the same host reuse them
+    instead of opening new ones. Failed requests are retried with an increasing delay.
+
+    Parameters
+    ----------
+    pool_size : int, optional
+        The maximum number of connections that are kept open to each host.
+        Should be at least as large as the number of threads using the session.
+
+    Returns
+    -------
+    requests.Session
+        The configured session.
+    """
+    session = requests.Session()
+    session.headers.update({'User-Agent': USER_AGENT})
+
+    # once the retries run out, the last response is returned, so that `raise_for_status` reports it as usual
+    retries = Retry(
+        total=HTTP_RETRIES,
+        backoff_factor=HTTP_BACKOFF_FACTOR,
+        status_forcelist=(500, 502, 503, 504),
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retries)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+# a single session is shared by all download threads, so that connections are pooled and kept alive
+_SESSION = create_session()
+
+# films can share a poster, so recently fetched posters are kept by url, and saved posters by their hash.
+# Both only last for a single run of `get_posters`
+_poster_cache: OrderedDict[str, bytes] = OrderedDict()
+_saved_posters: dict[str, str] = {}
+_poster_cache_lock = threading.Lock()
+
+# the poster url found on each film page searched so far (None if it had none), keyed by the film's url
+_found_poster_urls: OrderedDict[str, Optional[str]] = OrderedDict()
+_found_poster_urls_lock = threading.Lock()
+
 
 def create_posters_dir(parent_dir: str, dir_name: str, msg: str) -> str:
     """Creates the directory in which the downloaded posters will be saved.
@@ -38,17 +132,21 @@ def create_posters_dir(parent_dir: str, dir_name: str, msg: str) -> str:
     str
         The full path of the poster directory.
     """
-    folder_path = Path(PurePath(parent_dir) / Path(dir_name))
+    folder_path = os.path.join(parent_dir, dir_name)
+    created = not os.path.exists(folder_path)
 
-    if not Path.exists(folder_path):
-        os.makedirs(folder_path)
+    os.makedirs(folder_path, exist_ok=True)  # also safe if the folder was created in the meantime
+    if created:
         print(msg)
 
-    return str(folder_path)
+    return folder_path
 
 
 def get_film_page_html(
-    film_url: str, msg: str, progress_indicator: Callable[[str, Optional[int]], None] = show_progress_bar
+    film_url: str,
+    msg: str,
+    progress: Optional[Progress] = None,
+    session: requests.Session = _SESSION,
 ) -> str:
     """Returns the contents (the html) of a film's letterboxd page.
 
@@ -57,33 +155,34 @@ def get_film_page_html(
     film_url : str
         The Letterboxd url of this movie's page.
     msg : str
-        The message to show when showing the progress indicator.
-    progress_indicator : callable[[str, Optional[int]], None]
-        A callable function that shows a progress bar.
-
-        The function takes a string that will be the message displayed alongside the progress bar.
-        Optionally, an integer representing the total size of data being processed can be provided.
+        The message to show alongside the download's progress bar.
+    progress : Progress or None, optional
+        The progress display on which the download's progress bar is shown. Nothing is shown if not given.
+    session : requests.Session, optional
+        The http session through which the page is fetched.
 
     Returns
     -------
     str
         The html contents of the movie's Letterboxd page.
+
+    Raises
+    ------
+    requests.exceptions.HTTPError
+        If the page could not be fetched.
     """
     try:
-        film_page_html = requests.get(film_url, stream=True)
+        film_page_html = session.get(film_url, stream=True, timeout=HTTP_TIMEOUT)
     except requests.exceptions.ConnectionError:
         raise requests.exceptions.ConnectionError
 
-    total = film_page_html.headers.get('content-length')
-
-    if not total:
-        progress_indicator(msg, None)
-    else:
-        progress_indicator(msg, int(total))
-    return film_page_html.text
+    with film_page_html:
+        film_page_html.raise_for_status()
+        page_contents = read_with_progress(film_page_html, msg, progress)
+    return page_contents.decode(film_page_html.encoding or 'utf-8', errors='replace')
 
 
-def get_poster_url(film_page_contents: str, url_pattern: str = FILM_POSTER_URL_PATTERN) -> Optional[str]:
+def get_poster_url(film_page_contents: str, url_re: re.Pattern = FILM_POSTER_URL_RE) -> Optional[str]:
     """Returns the url of the film's poster, given the url of the film page itself.
     Returns None if there is no match (dictated by the url pattern) for a film poster.
 
@@ -91,27 +190,28 @@ def get_poster_url(film_page_contents: str, url_pattern: str = FILM_POSTER_URL_P
     ----------
     film_page_contents : str
         The content (html) of the film's page on Letterboxd.
-    url_pattern : str, optional
-        The pattern with which to match a film poster's url, which is located in the `film_page_contents`.
+    url_re : re.Pattern, optional
+        The compiled pattern with which to match a film poster's url, which is located in the `film_page_contents`.
 
     Returns
     -------
     str or None
-        The film poster's url, or None if no url that matched the `url_pattern` was found.
+        The film poster's url, or None if no url that matched the `url_re` was found.
     """
-    soup = BeautifulSoup(film_page_contents, 'html.parser')
-
-    # find the poster links in the script tags of the page
-    script_tags = str(soup.find_all('script'))
-
-    if match := re.search(url_pattern, script_tags):
-        poster_url = match.group(0)
-        return poster_url
+    # find the poster links in the script tags of the page. The contents of each tag are searched in place,
+    # rather than parsing the whole page
+    for script_tag in SCRIPT_TAG_RE.finditer(film_page_contents):
+        if match := url_re.search(film_page_contents, script_tag.start(1), script_tag.end(1)):
+            poster_url = match.group(0)
+            return poster_url
     return None
 
 
 def get_poster_contents(
-    film_poster_url: str, msg: str, progress_indicator: Callable[[str, Optional[int]], None] = show_progress_bar
+    film_poster_url: str,
+    msg: str,
+    progress: Optional[Progress] = None,
+    session: requests.Session = _SESSION,
 ) -> bytes:
     """Returns the raw content (bytes) of the film poster image that is located at the given url.
 
@@ -120,42 +220,41 @@ def get_poster_contents(
     film_poster_url : str
         The url of the film poster image.
     msg : str
-        The message to show when showing the progress indicator.
-    progress_indicator : callable[[str, Optional[int]], None]
-        A callable function that shows a progress bar.
+        The message to show alongside the download's progress bar.
+    progress : Progress or None, optional
+        The progress display on which the download's progress bar is shown. Nothing is shown if not given.
+    session : requests.Session, optional
+        The http session through which the poster is fetched.
 
-        The function takes a string that will be the message displayed alongside the progress bar.
-        Optionally, an integer representing the total size of data being processed can be provided.
     Returns
     -------
     bytes
         The raw content (bytes) of the film poster image.
+
+    Raises
+    ------
+    requests.exceptions.HTTPError
+        If the poster could not be fetched.
     """
     try:
-        poster_contents = requests.get(film_poster_url)
+        poster_contents = session.get(film_poster_url, stream=True, timeout=HTTP_TIMEOUT)
     except requests.exceptions.ConnectionError:
         raise requests.exceptions.ConnectionError
 
-    total = poster_contents.headers.get('content-length')
-
-    if not total:
-        progress_indicator(msg, None)
-    else:
-        progress_indicator(msg, int(total))
-    return poster_contents.content
+    with poster_contents:
+        poster_contents.raise_for_status()
+        return read_with_progress(poster_contents, msg, progress)
 
 
 def download_poster(
     poster_contents: bytes,
     film_name: str,
     download_location: str,
-    msg: str,
-    extension='.jpg',
-    progress_indicator: Callable[[str, Optional[int]], None] = show_progress_bar,
+    extension=POSTER_EXTENSION,
 ) -> None:
     """Downloads the film poster's contents (bytes), and saves them in the provided download location.
-    The image will be saved under a name that corresponds to the name of the film, and under the provided
-    file extension.
+    The image will be saved under a name that corresponds to the name of the film (see `poster_file_name`),
+    and under the provided file extension.
 
     Parameters
     ----------
@@ -172,13 +271,91 @@ def download_poster(
     -------
     None
     """
-    picture_path = str(Path(download_location) / Path(film_name + extension))
+    save_resized_poster(poster_contents, os.path.join(download_location, poster_file_name(film_name, extension)))
+
+
+def save_resized_poster(poster_contents: bytes, picture_path: str) -> None:
+    """Shrinks the film poster by `SHRINK_FACTOR`, and saves it under the given path.
+
+    The poster is written to a partial file first, so `picture_path` only ever holds a complete poster.
+
+    Parameters
+    ----------
+    poster_contents : bytes
+        The raw byes that represent the contents of the film poster.
+    picture_path : str
+        The full path (absolute path) under which the poster will be saved. Its extension decides the image format.
+
+    Returns
+    -------
+    None
+    """
+    # Pillow releases the GIL while decoding, resizing and encoding, so posters saved from different threads
+    # are already shrunk side by side
+    resized_contents = resize_poster(poster_contents, os.path.splitext(picture_path)[1])
+
+    with _open_atomically(picture_path) as f:
+        f.write(resized_contents)
+
+
+def resize_poster(poster_contents: bytes, extension: str = POSTER_EXTENSION) -> bytes:
+    """Returns the contents of the film poster, shrunk by `SHRINK_FACTOR`.
+
+    Nothing is read from or written to disk.
+
+    Parameters
+    ----------
+    poster_contents : bytes
+        The raw byes that represent the contents of the film poster.
+    extension : str, optional
+        The file extension that the film poster will be saved with, which decides the image format.
+
+    Returns
+    -------
+    bytes
+        The contents of the shrunk poster.
+    """
+    image_format = Image.registered_extensions().get(extension.lower())
+    resized_contents = io.BytesIO()
 
     with Image.open(io.BytesIO(poster_contents)) as im:
         smaller_dims = (im.width // SHRINK_FACTOR, im.height // SHRINK_FACTOR)
-        resized = im.resize(smaller_dims) # save memory by saving a smaller version of the poster
-        resized.save(picture_path)
-        progress_indicator(msg, None)
+        im.draft('RGB', smaller_dims)  # let the jpeg decoder scale the poster down while decoding it
+        # the decoder may already have produced the smaller size. Only other sizes, or other formats, need a resize
+        resized = im if im.size == smaller_dims else im.resize(smaller_dims)
+        resized.save(resized_contents, image_format or im.format)
+
+    return resized_contents.getvalue()
+
+
+def stream_poster(film_poster_url: str, picture_path: str, session: requests.Session = _SESSION) -> None:
+    """Saves the film poster located at the given url as it is, writing it to disk while it is downloaded.
+
+    Unlike `download_poster`, the poster is neither held in memory, nor decoded and resized.
+
+    Parameters
+    ----------
+    film_poster_url : str
+        The url of the film poster image.
+    picture_path : str
+        The full path (absolute path) under which the poster will be saved.
+    session : requests.Session, optional
+        The http session through which the poster is fetched.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    requests.exceptions.HTTPError
+        If the poster could not be fetched, in which case nothing is saved.
+    """
+    with session.get(film_poster_url, stream=True, timeout=HTTP_TIMEOUT) as response:
+        response.raise_for_status()
+        response.raw.decode_content = True
+        with _open_atomically(picture_path) as f:
+            shutil.copyfileobj(response.raw, f, POSTER_STREAM_CHUNK_SIZE)
 
 
 def all_posters_downloaded(csv_sections: CSVInfo, posters_dir_path: Path) -> bool:
@@ -196,14 +373,401 @@ def all_posters_downloaded(csv_sections: CSVInfo, posters_dir_path: Path) -> boo
     bool
         True if all the posters of the films in the csv file have been downloaded, False otherwise.
     """
-    poster_count = len(list(posters_dir_path.iterdir()))
-    movie_count = len(csv_sections.film_info)
-    return poster_count == movie_count
+    existing_posters = list_posters(posters_dir_path)
+    return all(poster_file_name(film_name) in existing_posters for film_name in csv_sections.film_info.names)
+
+
+def poster_file_name(film_name: str, extension: str = POSTER_EXTENSION) -> str:
+    """Returns the name of the file under which the poster of the given film is saved.
+
+    Characters that cannot be part of a file name on the current system are replaced with underscores, so that
+    every film name gives a file that lies directly inside the posters directory. Other characters are kept, so
+    posters saved before film names were made safe keep their names.
+
+    Parameters
+    ----------
+    film_name : str
+        The name of the film.
+    extension : str, optional
+        The file extension that the film poster is saved with.
+
+    Returns
+    -------
+    str
+        The file name of the film's poster.
+    """
+    return UNSAFE_FILE_NAME_CHARS_RE.sub('_', film_name) + extension
+
+
+@contextmanager
+def _open_atomically(picture_path: str):
+    """Opens a partial file to write a poster into, which only replaces `picture_path` once it is fully written.
+
+    A run that is cut short therefore never leaves behind a truncated poster that would be taken as downloaded
+    on the next run. The partial file is removed if writing fails.
+
+    Parameters
+    ----------
+    picture_path : str
+        The full path (absolute path) under which the poster will be saved.
+
+    Yields
+    ------
+    BinaryIO
+        The partial file, opened for writing bytes.
+    """
+    partial_path = picture_path + PARTIAL_FILE_SUFFIX
+    try:
+        with open(partial_path, 'wb') as f:
+            yield f
+        os.replace(partial_path, picture_path)
+    except BaseException:
+        with suppress(OSError):
+            os.remove(partial_path)
+        raise
+
+
+def list_posters(posters_dir: Path) -> set[str]:
+    """Returns the names of all the files in the posters directory, from a single listing of the directory.
+
+    Checking whether a poster was downloaded is then a lookup in the returned set, rather than a separate
+    check on the filesystem for each film.
+
+    Parameters
+    ----------
+    posters_dir : Path
+        The path representing the location of the posters directory, in which posters are downloaded.
+
+    Returns
+    -------
+    set[str]
+        The names of the files in the posters directory.
+    """
+    return {entry.name for entry in os.scandir(posters_dir)}
+
+
+def load_poster_urls(posters_dir: Path) -> dict[str, str]:
+    """Returns the poster urls that were found on previous runs, keyed by the url of each film's page.
+
+    Parameters
+    ----------
+    posters_dir : Path
+        The path representing the location of the posters directory, in which the poster urls are saved.
+
+    Returns
+    -------
+    dict[str, str]
+        The poster url of each film, keyed by the film's Letterboxd url.
+        Empty if no poster urls were saved, or if they could not be read.
+    """
+    try:
+        with open(os.path.join(posters_dir, POSTER_URLS_FILE_NAME), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
 
 
-def get_posters(csv_sections: CSVInfo, posters_dir: Path, console: Console) -> None:
+def save_poster_urls(poster_urls: dict[str, str], posters_dir: Path) -> None:
+    """Saves the poster urls inside the posters directory, so that later runs can skip searching film pages.
+
+    Parameters
+    ----------
+    poster_urls : dict[str, str]
+        The poster url of each film, keyed by the film's Letterboxd url.
+    posters_dir : Path
+        The path representing the location of the posters directory, in which the poster urls are saved.
+
+    Returns
+    -------
+    None
+    """
+    with open(os.path.join(posters_dir, POSTER_URLS_FILE_NAME), 'w', encoding='utf-8') as f:
+        json.dump(poster_urls, f, indent=2)
+
+
+def _find_poster_url(
+    film_url: str,
+    film_name: str,
+    session: requests.Session,
+    progress: Optional[Progress],
+    refresh: bool = False,
+) -> Optional[str]:
+    """Returns the url of the film's poster, found by searching the film's page.
+
+    Results are kept in memory by film url, so a film page that is listed more than once is only fetched once,
+    even when it has no poster. Only the poster url is kept, rather than the whole page, and once
+    POSTER_URL_CACHE_SIZE film pages are kept, the one used the longest ago is forgotten first.
+
+    Parameters
+    ----------
+    film_url : str
+        The Letterboxd url of this movie's page.
+    film_name : str
+        The name of the film, shown alongside the page download's progress bar.
+    session : requests.Session
+        The http session through which the page is fetched.
+    progress : Progress or None
+        The progress display on which the page download's progress bar is shown. Nothing is shown if None.
+    refresh : bool, optional
+        Whether the page is searched again, even if it was searched before.
+
+    Returns
+    -------
+    str or None
+        The film poster's url, or None if the page has no poster.
+    """
+    if not refresh:
+        with _found_poster_urls_lock:
+            if film_url in _found_poster_urls:
+                _found_poster_urls.move_to_end(film_url)
+                return _found_poster_urls[film_url]
+
+    page_contents = get_film_page_html(film_url, f'{film_name}: searching film page', progress, session)
+    poster_url = get_poster_url(page_contents)
+
+    with _found_poster_urls_lock:
+        _found_poster_urls[film_url] = poster_url
+        if len(_found_poster_urls) > POSTER_URL_CACHE_SIZE:
+            _found_poster_urls.popitem(last=False)  # forget the least recently used film page
+    return poster_url
+
+
+def _get_cached_poster_contents(
+    film_poster_url: str, msg: str, progress: Optional[Progress], session: requests.Session
+) -> bytes:
+    """Returns the raw content (bytes) of the film poster image that is located at the given url.
+
+    Posters that were fetched recently are returned from memory instead of being fetched again.
+
+    Parameters
+    ----------
+    film_poster_url : str
+        The url of the film poster image.
+    msg : str
+        The message to show alongside the download's progress bar.
+    progress : Progress or None
+        The progress display on which the download's progress bar is shown. Nothing is shown if None.
+    session : requests.Session
+        The http session through which the poster is fetched.
+
+    Returns
+    -------
+    bytes
+        The raw content (bytes) of the film poster image.
+    """
+    with _poster_cache_lock:
+        if film_poster_url in _poster_cache:
+            _poster_cache.move_to_end(film_poster_url)
+            return _poster_cache[film_poster_url]
+
+    poster_contents = get_poster_contents(film_poster_url, msg, progress, session)
+
+    with _poster_cache_lock:
+        _poster_cache[film_poster_url] = poster_contents
+        if len(_poster_cache) > POSTER_CACHE_SIZE:
+            _poster_cache.popitem(last=False)  # forget the least recently used poster
+    return poster_contents
+
+
+def _save_poster(poster_contents: bytes, picture_path: str) -> None:
+    """Saves the film poster in the posters directory.
+
+    If an identical poster was already saved, the new poster is hard-linked to it instead of being
+    resized and saved again.
+
+    Parameters
+    ----------
+    poster_contents : bytes
+        The raw byes that represent the contents of the film poster.
+    picture_path : str
+        The full path (absolute path) under which the poster will be saved.
+
+    Returns
+    -------
+    None
+    """
+    digest = hashlib.blake2b(poster_contents, digest_size=16).hexdigest()
+
+    with _poster_cache_lock:
+        saved_path = _saved_posters.get(digest)
+
+    if saved_path:
+        try:
+            os.link(saved_path, picture_path)
+            return
+        except OSError:
+            pass  # the saved poster is gone, or links are not supported. Save the poster as usual
+
+    save_resized_poster(poster_contents, picture_path)
+
+    with _poster_cache_lock:
+        _saved_posters[digest] = picture_path
+
+
+def _process_film(
+    film_name: str,
+    film_url: str,
+    picture_path: str,
+    poster_urls: dict[str, str],
+    session: requests.Session,
+    progress: Optional[Progress] = None,
+    resize: bool = True,
+) -> tuple[str, str]:
+    """Finds and downloads the poster of a single film.
+
+    This runs inside a worker thread, so nothing is printed. Downloads are only shown on the shared progress display.
+    Films whose posters have already been downloaded are expected to be filtered out beforehand.
+
+    Parameters
+    ----------
+    film_name : str
+        The name of the film.
+    film_url : str
+        The Letterboxd url of the film's page.
+    picture_path : str
+        The full path (absolute path) under which the poster will be saved.
+    poster_urls : dict[str, str]
+        Poster urls that are already known, keyed by film url. The film's page is only searched when
+        its poster url is missing, in which case the newly found url is added.
+    session : requests.Session
+        The http session through which the film page and poster are fetched.
+    progress : Progress or None, optional
+        The progress display on which the film's downloads are shown. Nothing is shown if not given.
+    resize : bool, optional
+        Whether the poster is shrunk before being saved. When False, the poster is saved as it is downloaded.
+
+    Returns
+    -------
+    tuple[str, str]
+        The name of the film, and the status of its poster (either `POSTER_SAVED` or `POSTER_NOT_FOUND`).
+    """
+    saved_poster_url = poster_urls.get(film_url)
+
+    if saved_poster_url:
+        try:
+            _save_film_poster(saved_poster_url, film_name, picture_path, session, progress, resize)
+            return film_name, POSTER_SAVED
+        except _FILM_FETCH_ERRORS:
+            # the poster could not be fetched from its saved url, which may have moved. The film page is searched again
+            poster_urls.pop(film_url, None)
+
+    try:
+        poster_url = _find_poster_url(film_url, film_name, session, progress, refresh=bool(saved_poster_url))
+    except _FILM_FETCH_ERRORS:
+        return film_name, POSTER_NOT_FOUND
+    if not poster_url or poster_url == saved_poster_url:
+        return film_name, POSTER_NOT_FOUND
+
+    poster_urls[film_url] = poster_url
+    try:
+        _save_film_poster(poster_url, film_name, picture_path, session, progress, resize)
+    except _FILM_FETCH_ERRORS:
+        poster_urls.pop(film_url, None)
+        return film_name, POSTER_NOT_FOUND
+    return film_name, POSTER_SAVED
+
+
+def _save_film_poster(
+    poster_url: str,
+    film_name: str,
+    picture_path: str,
+    session: requests.Session,
+    progress: Optional[Progress],
+    resize: bool,
+) -> None:
+    """Fetches the film poster located at the given url, and saves it under the given path.
+
+    Parameters
+    ----------
+    poster_url : str
+        The url of the film poster image.
+    film_name : str
+        The name of the film, shown alongside the download's progress bar.
+    picture_path : str
+        The full path (absolute path) under which the poster will be saved.
+    session : requests.Session
+        The http session through which the poster is fetched.
+    progress : Progress or None
+        The progress display on which the download is shown. Nothing is shown if None.
+    resize : bool
+        Whether the poster is shrunk before being saved. When False, the poster is saved as it is downloaded.
+
+    Returns
+    -------
+    None
+
+    Raises
+    ------
+    requests.exceptions.HTTPError
+        If the poster could not be fetched.
+    PIL.UnidentifiedImageError
+        If what was fetched is not an image. It is then also forgotten by the in-memory poster cache.
+    """
+    if not resize:
+        stream_poster(poster_url, picture_path, session)
+        return
+
+    poster_content = _get_cached_poster_contents(poster_url, f'{film_name}: fetching poster', progress, session)
+    try:
+        _save_poster(poster_content, picture_path)
+    except UnidentifiedImageError:
+        with _poster_cache_lock:
+            _poster_cache.pop(poster_url, None)
+        raise
+
+
+def _clear_poster_caches() -> None:
+    """Forgets the posters that were fetched, and the posters that were saved, by the current run.
+
+    Returns
+    -------
+    None
+    """
+    with _poster_cache_lock:
+        _poster_cache.clear()
+        _saved_posters.clear()
+
+
+def _print_film_status(film_name: str, status: str, console: Console) -> None:
+    """Prints the outcome of fetching a film's poster.
+
+    Parameters
+    ----------
+    film_name : str
+        The name of the film.
+    status : str
+        The status of the film's poster, as returned by `_process_film`.
+    console : Console
+        A Console object from the `rich` library, that is used to display colors and other styles.
+
+    Returns
+    -------
+    None
+    """
+    print(f'\n ┃ {film_name.upper()}')
+
+    if status == POSTER_EXISTS:
+        print(' ┗ Poster already exists. Skipping this film')
+    elif status == POSTER_SAVED:
+        console.print(' ┃ Found poster', style=IN_PROGRESS_COLOR)
+        print(' ┗ Poster saved')
+    else:
+        console.print(" ━┫ Couldn't find poster", style=SOFT_ERROR_COLOR)
+        print()
+
+
+def get_posters(
+    csv_sections: CSVInfo,
+    posters_dir: Path,
+    console: Console,
+    max_workers: int = MAX_DOWNLOAD_WORKERS,
+    resize: bool = True,
+) -> None:
     """Finds and downloads the posters for the films listed in the csv file.
 
+    Films are processed concurrently by a pool of threads, and the outcome for each film is printed as soon
+    as it is done. A single progress bar shows how many of the films have been dealt with.
+
     Parameters
     ----------
     csv_sections : CSVInfo
@@ -212,48 +776,68 @@ def get_posters(csv_sections: CSVInfo, posters_dir: Path, console: Console) -> N
         The path representing the location of the posters directory, in which posters are downloaded.
     console : Console
         A Console object from the `rich` library, that is used to display colors and other styles.
+    max_workers : int, optional
+        The maximum number of films whose posters are fetched at the same time.
+        A dedicated session is used when this exceeds the connection pool of the shared one.
+    resize : bool, optional
+        Whether posters are shrunk before being saved. When False, posters are saved as they are downloaded.
 
     Returns
     -------
     None
     """
-    img_extension = '.jpg'  # file extension with which posters will be saved
-    for film in csv_sections.film_info:
-        film_url = film['URL']
-        film_name = film['Name']
-        print(f'\n ┃ {film_name.upper()}')
-
-        # check if the poster already exists before trying to download it
-        if Path.exists(Path(posters_dir) / Path(film_name + img_extension)):
-            print(' ┗ Poster already exists. Skipping this film')
-            continue
+    # list the posters directory once, instead of checking for each film's poster separately
+    existing_posters = list_posters(posters_dir)
+    poster_urls = load_poster_urls(posters_dir)
+    saved_poster_urls = dict(poster_urls)
+
+    # shared by all threads. Each download adds its own bar, below the one for the films
+    progress = create_films_progress_bar(console)
+
+    # everything entered on the stack is closed once the run ends, however it ends, the threads being joined first
+    with ExitStack() as stack:
+        # posters fetched and saved during this run are forgotten once it ends, as later runs may save elsewhere
+        stack.callback(_clear_poster_caches)
+
+        # a dedicated session is only made when the shared one has too few connections for all the threads
+        session = _SESSION
+        if max_workers > MAX_DOWNLOAD_WORKERS:
+            session = stack.enter_context(create_session(max_workers))
+
+        executor = stack.enter_context(ThreadPoolExecutor(max_workers=max_workers))
+
+        futures = []
+        for film_name, film_url in zip(csv_sections.film_info.names, csv_sections.film_info.urls):
+            # the film name is made safe to use as a file name once, and the result reused for its poster's path
+            file_name = poster_file_name(film_name)
+            if file_name in existing_posters:
+                _print_film_status(film_name, POSTER_EXISTS, console)
+                continue
+            picture_path = os.path.join(posters_dir, file_name)
+            future = executor.submit(
+                _process_film, film_name, film_url, picture_path, poster_urls, session, progress, resize
+            )
+            futures.append(future)
+
         try:
-            msg = f' ┃ Searching film page'
-            page_contents = get_film_page_html(film_url, msg)
-        except requests.exceptions.ConnectionError:
+            with progress:
+                task = progress.add_task(f'[{BAR_COLOR}]Downloading posters', total=len(futures))
+                for future in as_completed(futures):
+                    film_name, status = future.result()
+                    if status == POSTER_SAVED:
+                        existing_posters.add(poster_file_name(film_name))
+                    _print_film_status(film_name, status, console)
+                    progress.advance(task)
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout):
+            executor.shutdown(wait=False, cancel_futures=True)
             console.print(' ━┫ There seems to be a problem with your internet connection.\n', style=HARD_ERROR_COLOR)
             sys.exit()
         except KeyboardInterrupt:
+            executor.shutdown(wait=False, cancel_futures=True)
             sys.exit('\n┗━ Goodbye for now ━━━\n')
-
-        poster_url = get_poster_url(page_contents)
-
-        if poster_url:
-            console.print(' ┃ Found poster', style=IN_PROGRESS_COLOR)
-            try:
-                msg = ' ┃ Fetching poster'
-                poster_content = get_poster_contents(poster_url, msg)
-            except requests.exceptions.ConnectionError:
-                console.print(
-                    ' ━┫ There seems to be a problem with your internet connection.\n', style=HARD_ERROR_COLOR
-                )
-                sys.exit()
-            except KeyboardInterrupt:
-                sys.exit('\n┗━ Goodbye for now ━━━\n')
-
-            msg = ' ┗ Saving poster'
-            download_poster(poster_content, film_name, str(posters_dir), msg, img_extension)
-        else:
-            console.print(" ━┫ Couldn't find poster", style=SOFT_ERROR_COLOR)
-            print()
-            continue
+        finally:
+            # keep the poster urls found so far, even when the run is cut short. The file is only written when they
+            # changed. A copy is compared and saved, since unfinished threads may still be changing the original
+            found_poster_urls = dict(poster_urls)
+            if found_poster_urls != saved_poster_urls:
+                save_poster_urls(found_poster_urls, posters_dir)
@@ -1,30 +1,73 @@
 """Utility functions for displaying progress bars"""
 
+import os
+import sys
 from typing import Optional
+from requests import Response
+from rich.console import Console
 from rich.progress import Progress
 
-PROGRESS_BAR_INCREASE = 0.05
+DOWNLOAD_CHUNK_SIZE = 1 << 16  # bytes read at a time from a response, between progress bar updates
 BAR_COLOR = 'green'
+# progress bars are only drawn for a terminal, and can be turned off by setting the `NO_PROGRESS` environment variable
+_ENABLE_PROGRESS = sys.stdout.isatty() and not os.environ.get('NO_PROGRESS')
 
 
-def show_progress_bar(message: str, total: Optional[int] = None) -> None:
-    """Shows a progress bar
+def read_with_progress(response: Response, message: str, progress: Optional[Progress] = None) -> bytes:
+    """Reads and returns the whole body of the response, showing how much of it has been downloaded so far.
 
     Parameters
     ----------
+    response : Response
+        The response to read. It should have been requested with `stream=True`, so that its body
+        has not been downloaded yet.
     message : str
         The message to be displayed, alongside the progress bar.
-    total : int or None, Optional
-        The total size of the information being downloaded.
+    progress : Progress or None, optional
+        The progress display on which a bar for this download is shown, and removed once the download is done.
+        Nothing is shown if no progress display is given, or if it is disabled.
 
-        When total is provided, a "determinate" progress bar is displayed.
-        An "indeterminate" progress bar is displayed if no total is given.
+        When the size of the body is known, a "determinate" progress bar is displayed.
+        An "indeterminate" progress bar is displayed otherwise, including for compressed bodies, whose
+        `content-length` is not the size of the decompressed chunks that are read.
+
+    Returns
+    -------
+    bytes
+        The body of the response. The response is closed once it has been read.
+    """
+    total = None if response.headers.get('content-encoding') else response.headers.get('content-length')
+    task = None
+    if progress is not None and not progress.disable:
+        task = progress.add_task(f"[{BAR_COLOR}]{message}", total=int(total) if total else None)
+
+    body = bytearray()
+    try:
+        for chunk in response.iter_content(DOWNLOAD_CHUNK_SIZE):
+            body += chunk
+            if task is not None:
+                progress.update(task, advance=len(chunk))
+    finally:
+        response.close()
+        if task is not None:
+            progress.remove_task(task)
+    return bytes(body)
+
+
+def create_films_progress_bar(console: Console) -> Progress:
+    """Returns a single progress bar that tracks how many films have been dealt with.
+
+    Anything printed while the progress bar is shown appears above it. When the output is not a terminal, or
+    the `NO_PROGRESS` environment variable is set, the progress bar is disabled and never drawn.
+
+    Parameters
+    ----------
+    console : Console
+        A Console object from the `rich` library, on which the progress bar is displayed.
+
+    Returns
+    -------
+    Progress
+        The progress bar. It is shown while used as a context manager, and removed once done.
     """
-    with Progress() as progress:
-        if total:
-            task = progress.add_task(f"[{BAR_COLOR}]{message}", total=total)
-            while not progress.finished:
-                progress.update(task, advance=PROGRESS_BAR_INCREASE)
-        else:
-            task = progress.add_task(f"[{BAR_COLOR}]{message}", total=None, start=False)
-            progress.update(task)
+    return Progress(console=console, transient=True, disable=not _ENABLE_PROGRESS)